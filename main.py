@@ -15,12 +15,14 @@ Options:
 import enum
 import operator
 import os
+import re
+import sys
 import warnings
-from collections import defaultdict
 from dataclasses import dataclass
 from os import DirEntry
 from pathlib import Path
-from typing import List, Optional, Union, Iterable, Collection, Set, Tuple, Callable, Dict, Iterator
+from typing import List, Optional, Union, Iterable, Collection, Set, Tuple, Callable, Dict, Iterator, TextIO, \
+    FrozenSet, Mapping
 
 from docopt import docopt
 from lxml import etree
@@ -58,12 +60,41 @@ class FileType(enum.Enum):
     """Image file"""
 
 
+_MISSING = object()
+"""Sentinel for the dictionary lookups where `None` is a valid value."""
+
+_TYPE_TO_LANG: Dict[FileType, Optional[Language]] = {
+    FileType.ASM_SOURCE: Language.ASM,
+    FileType.C_SOURCE: Language.C,
+    FileType.TEXT_DOCUMENT: None,
+}
+"""Language of the supported file types (`None` for the non-source files)."""
+
+_LANG_SETS: Dict[Optional[Language], FrozenSet[Language]] = {
+    **{lang: frozenset((lang,)) for lang in Language},
+    None: frozenset()
+}
+"""Single-language sets, shared by all of the values added with the same language."""
+
+_RTE_EXT_TO_TYPE: Dict[str, FileType] = {
+    ".s": FileType.ASM_SOURCE,
+    ".c": FileType.C_SOURCE,
+    ".cpp": FileType.CPP_SOURCE,
+    ".h": FileType.TEXT_DOCUMENT,
+}
+"""File type of the RTE files by their extension (this information is not provided for RTE files)."""
+
+
 # region XML data structures for Project File
 
 @dataclass
 class Target:
+    __slots__ = ("name", "toolset", "compiler", "options", "build", "groups")
+
     @dataclass
     class Toolset:
+        __slots__ = ("number", "name")
+
         number: int
         name: str
 
@@ -97,6 +128,8 @@ class Target:
         class Misc:
             @dataclass
             class Memory:
+                __slots__ = ("name", "type", "start", "size")
+
                 @enum.unique
                 class Type(enum.Enum):
                     """TODO: Real meaning unknown."""
@@ -142,6 +175,8 @@ class Target:
 
     @dataclass
     class File:
+        __slots__ = ("name", "type", "path", "include_in_build", "always_build")
+
         name: str
         type: FileType
         path: str
@@ -152,6 +187,8 @@ class Target:
 
     @dataclass
     class Group:
+        __slots__ = ("name", "files")
+
         name: str
         files: List['Target.File']
 
@@ -165,8 +202,12 @@ class Target:
 
 @dataclass
 class RTE:
-    @dataclass
+    __slots__ = ("packages", "components", "files")
+
+    @dataclass(eq=False)
     class TargetInfo:
+        __slots__ = ("name", "version_match_mode")
+
         @enum.unique
         class VersionMatchMode(enum.Enum):
             FIXED = "fixed"
@@ -174,16 +215,20 @@ class RTE:
         name: str
         version_match_mode: Optional[VersionMatchMode]
 
-    @dataclass
+    @dataclass(eq=False)
     class Package:
+        __slots__ = ("name", "url", "vendor", "version", "target_infos")
+
         name: str
         url: str
         vendor: str
         version: str
         target_infos: List['RTE.TargetInfo']
 
-    @dataclass
+    @dataclass(eq=False)
     class Component:
+        __slots__ = ("class_", "group", "vendor", "version", "condition", "package", "target_infos")
+
         class_: str
         group: str
         vendor: str
@@ -194,6 +239,9 @@ class RTE:
 
     @dataclass
     class File:
+        __slots__ = ("attr", "category", "condition", "name", "version", "instance", "component", "package",
+                     "target_infos")
+
         @enum.unique
         class Attribute(enum.Enum):
             CONFIG = "config"
@@ -217,6 +265,31 @@ class RTE:
     files: List[File]
 
 
+_PACKAGE_IDENTITY_ATTRIBUTES: Callable[[Mapping[str, str]], Tuple[str, str, str, str]] = operator.itemgetter(
+    "name", "url", "vendor", "version"
+)
+"""Extract the four identifying attributes (name, url, vendor and version) of the package XML element."""
+
+
+def _package_identity(attrib: Mapping[str, str]) -> Tuple[str, str, str, str]:
+    """
+    Get the identity of the package from the attributes of any package XML element referencing it.
+
+    The same attribute values are repeated across the RTE entries - interning them saves memory and makes the
+    comparisons of the package identities (dictionary keys) cheaper.
+    """
+    # noinspection PyTypeChecker
+    return tuple(map(sys.intern, _PACKAGE_IDENTITY_ATTRIBUTES(attrib)))
+
+
+_VERSION_MATCH_MODES: Dict[Optional[str], Optional[RTE.TargetInfo.VersionMatchMode]] = {
+    None: None,
+    "": None,
+    **{vmm.value: vmm for vmm in RTE.TargetInfo.VersionMatchMode}
+}
+"""Version match modes by their representation in the µVision XML files (missing or empty value means none)."""
+
+
 # endregion XML data structures for Project File
 
 # region XML data structures for Project Options file
@@ -269,6 +342,55 @@ class Group:
 
 # region XML parsing helper functions
 
+_XML_PARSER_OPTIONS = dict(collect_ids=False, huge_tree=True, remove_blank_text=True, remove_comments=True,
+                           resolve_entities=False)
+"""Parser options for the µVision XML files - no IDs or entities are used, comments and whitespace between tags are
+irrelevant."""
+
+_XPATH_CACHE: Dict[str, etree.XPath] = {}
+"""Compiled XPath expressions used by :func:`text`, keyed by the expression string."""
+
+# Compiled XPath expressions for the multi-level element lookups.
+_XP_MEMORIES = etree.XPath("OnChipMemories/*")
+_XP_FILES = etree.XPath("Files/File")
+_XP_GROUPS = etree.XPath("Groups/Group")
+_XP_TARGET_INFOS = etree.XPath("targetInfos/targetInfo")
+
+
+# noinspection PyProtectedMember
+def iter_elements(path: str, *paths: str) -> Iterator[etree._Element]:
+    """
+    Incrementally parse the XML file and yield only the elements of interest.
+
+    The first yielded element is the root element (to enable validation of the file type), followed by every element
+    matching any of the `paths` (relative to the root element, e.g. "Targets/Target") as soon as it is fully parsed.
+    Yielded elements are discarded once processed to keep the memory footprint low, references shall not be kept.
+    """
+    paths = {tuple(p.split("/")) for p in paths}
+    context = etree.iterparse(path, events=("end",), tag={p[-1] for p in paths}, **_XML_PARSER_OPTIONS)
+    root = None
+    for _, element in context:
+        if root is None:
+            root = element.getroottree().getroot()
+            yield root
+        # Element with the same tag can also be present elsewhere in the tree, check the whole path.
+        element_path = []
+        parent = element
+        while parent is not root:
+            element_path.append(parent.tag)
+            parent = parent.getparent()
+        if tuple(reversed(element_path)) not in paths:
+            continue
+        yield element
+        # Neither this element nor any of the previous siblings (already processed or irrelevant) are needed anymore.
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    if root is None:
+        # None of the elements of interest are present.
+        yield context.root
+
+
 def text(element: etree.ElementBase, name: str, is_attribute: bool = False, nullable: bool = False) -> Optional[str]:
     if is_attribute:
         if nullable:
@@ -276,7 +398,23 @@ def text(element: etree.ElementBase, name: str, is_attribute: bool = False, null
         else:
             return element.attrib[name]
 
-    value = element.xpath(name)
+    if name.isidentifier():
+        # Plain child tag - direct child traversal is much cheaper than invoking the XPath engine (or ElementPath
+        # used by find() and findtext()), and there is no need to build the list of all matches.
+        children = element.iterchildren(name)
+        child = next(children, None)
+        if child is None:
+            if nullable:
+                return None
+            raise ValueError(f"Only one '{name}' tag per tree is supported, 0  found")
+        if next(children, None) is not None:
+            raise ValueError(f"Only one '{name}' tag per tree is supported, {2 + sum(1 for _ in children)}  found")
+        return child.text
+
+    expr = _XPATH_CACHE.get(name)
+    if expr is None:
+        expr = _XPATH_CACHE[name] = etree.XPath(name)
+    value = expr(element)
 
     if (not value) and nullable:
         return None
@@ -286,16 +424,80 @@ def text(element: etree.ElementBase, name: str, is_attribute: bool = False, null
     return value[0].text
 
 
+def child(element: etree.ElementBase, name: str) -> etree.ElementBase:
+    """Get the child tag `name` of the element, which is required to be present (only the first one is used)."""
+    found = element.find(name)
+    if found is None:
+        raise ValueError(f"Only one '{name}' tag per tree is supported, 0  found")
+    return found
+
+
+class _DuplicateTag:
+    """Placeholder for the text of the child tag present more than once, see :func:`child_texts`."""
+    __slots__ = ("count",)
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+
+def child_texts(element: etree.ElementBase) -> Dict[str, Union[str, None, _DuplicateTag]]:
+    """
+    Get texts of all child tags in a single pass, for the elements of which (almost) all children are read.
+
+    Unlike with :func:`text`, missing and duplicated tags are only detected when the values are read, using
+    :func:`field_text`, :func:`field_bool` or :func:`field_file_type` (tags which are not read are not checked).
+    """
+    texts = {child.tag: child.text for child in element}
+    if len(texts) != len(element):
+        tags = [child.tag for child in element]
+        for tag in texts:
+            count = tags.count(tag)
+            if count > 1:
+                texts[tag] = _DuplicateTag(count)
+    return texts
+
+
+def field_text(fields: Dict[str, Union[str, None, _DuplicateTag]], name: str) -> Optional[str]:
+    """Get the text of the child tag `name` from the result of :func:`child_texts`."""
+    try:
+        value = fields[name]
+    except KeyError:
+        raise ValueError(f"Only one '{name}' tag per tree is supported, 0  found") from None
+    if isinstance(value, _DuplicateTag):
+        raise ValueError(f"Only one '{name}' tag per tree is supported, {value.count}  found")
+    return value
+
+
+_BOOL_VALUES: Dict[str, bool] = {"0": False, "1": True}
+"""Representation of the boolean values in the µVision XML files."""
+
+_BOOL_TABLES: Dict[Tuple[str, str], Dict[str, bool]] = {
+    ("0", "1"): _BOOL_VALUES,
+    ("0", "2"): {"0": False, "2": True},  # AlwaysBuild option uses a different value for true
+}
+"""Boolean value tables by their (false, true) representations, extended as other representations are used."""
+
+
+def _bool_value(value: Optional[str], name: str, values: Dict[str, bool] = _BOOL_VALUES) -> bool:
+    try:
+        return values[value]
+    except KeyError:
+        raise ValueError(f"'{value}' (of {name}) is not valid boolean value") from None
+
+
 def strict_bool(element: etree.ElementBase, name: str, nullable: bool = False, *,
                 false_value: str = "0", true_value: str = "1") -> Optional[bool]:
     value = text(element, name, nullable=nullable)
-    if value == false_value:
-        return False
-    if value == true_value:
-        return True
     if (value is None) and nullable:
         return None
-    raise ValueError(f"'{value}' (of {name}) is not valid boolean value")
+    values = _BOOL_TABLES.get((false_value, true_value))
+    if values is None:
+        values = _BOOL_TABLES[(false_value, true_value)] = {false_value: False, true_value: True}
+    return _bool_value(value, name, values)
+
+
+def field_bool(fields: Dict[str, Union[str, None, _DuplicateTag]], name: str) -> bool:
+    return _bool_value(field_text(fields, name), name)
 
 
 def strict_hex(element: etree.ElementBase, name: str) -> int:
@@ -305,6 +507,48 @@ def strict_hex(element: etree.ElementBase, name: str) -> int:
     return int(value, 16)
 
 
+_FILE_TYPES: Dict[str, FileType] = {str(ft.value): ft for ft in FileType}
+"""File types by their representation in the µVision XML files."""
+
+
+def _file_type_value(value: Optional[str], name: str) -> FileType:
+    try:
+        return _FILE_TYPES[value]
+    except KeyError:
+        raise ValueError(f"'{value}' (of {name}) is not valid file type") from None
+
+
+def strict_file_type(element: etree.ElementBase, name: str) -> FileType:
+    return _file_type_value(text(element, name), name)
+
+
+def field_file_type(fields: Dict[str, Union[str, None, _DuplicateTag]], name: str) -> FileType:
+    return _file_type_value(field_text(fields, name), name)
+
+
+def strict_version_match_mode(element: etree.ElementBase, name: str) -> Optional[RTE.TargetInfo.VersionMatchMode]:
+    value = element.get(name)
+    try:
+        return _VERSION_MATCH_MODES[value]
+    except KeyError:
+        # Let the enum report the invalid value.
+        return RTE.TargetInfo.VersionMatchMode(value)
+
+
+_LIST_SPLITTERS: Dict[str, Callable[[str], List[str]]] = {
+    ",": re.compile(r"\s*,\s*").split,
+    ";": re.compile(r"\s*;\s*").split,
+    " ": re.compile(r"\s+").split,
+}
+"""Splitters of the separated lists, also stripping whitespace around the separators (consecutive spaces are one)."""
+
+
+def text_list(element: etree.ElementBase, name: str, separator: str) -> List[str]:
+    value = (text(element, name) or "").strip()
+    # Empty value or consecutive separators would otherwise result in empty items.
+    return list(filter(None, _LIST_SPLITTERS[separator](value)))
+
+
 # endregion XML parsing helper functions
 
 
@@ -329,254 +573,222 @@ class UVisionProject:
         project_file_path = fp_base + ".uvprojx"
         project_options_path = fp_base + ".uvoptx"
 
-        with open(project_file_path) as f:
-            # noinspection PyProtectedMember
-            xproj: etree._Element = etree.parse(f).getroot()
-
-        with open(project_options_path) as f:
-            # noinspection PyProtectedMember
-            xopt: etree._Element = etree.parse(f).getroot()
-
         # region Project File
-        if xproj.tag != "Project":
+        xproj = iter_elements(project_file_path, "Targets/Target",
+                              "RTE/packages/package", "RTE/components/component", "RTE/files/file")
+        if next(xproj).tag != "Project":
             raise ValueError("Invalid uVision Project File XML file")
 
-        # noinspection PyCallByClass,SpellCheckingInspection
-        targets = [
-            Target(
-                name=text(target, "TargetName"),
-                toolset=Target.Toolset(
-                    number=strict_hex(target, "ToolsetNumber"),
-                    name=text(target, "ToolsetName")
-                ),
-                compiler=Target.Compiler(
-                    cc=text(target, "pCCUsed", nullable=True),
-                    ac6=strict_bool(target, "uAC6")
-                ),
-                options=next(
-                    # There is always only one package, but using generator is clean and
-                    # effective way of creating an inline local variable.
-                    Target.Options(
-                        common=next(
-                            Target.Options.Common(
-                                device=text(tco, "Device"),
-                                vendor=text(tco, "Vendor"),
-                                pack_id=text(tco, "PackID"),
-                                pack_url=text(tco, "PackURL"),
-                                cpu=text(tco, "Cpu"),
-                                device_id=int(text(tco, "DeviceId")),
-                                register_file=text(tco, "RegisterFile")
-                            ) for tco in to.xpath("TargetCommonOption")
+        targets: List[Target] = []
+        # RTE is populated as its elements are parsed (project without any RTE components does not have RTE section).
+        rte = RTE(packages=[], components=[], files=[])
+        # Packages by their identity, for resolving the package references of the components.
+        packages: Dict[Tuple[str, str, str, str], RTE.Package] = {}
+        # Identities of the packages of the components, resolved to the actual instances once all are known.
+        component_packages: List[Tuple[str, str, str, str]] = []
+        for element in xproj:
+            if element.tag == "Target":
+                # There is always only one of each of these option elements.
+                to = child(element, "TargetOption")
+                tco = child(to, "TargetCommonOption")
+                tcp = child(to, "CommonProperty")
+                to_taa = child(to, "TargetArmAds")
+                to_taa_m = child(to_taa, "ArmAdsMisc")
+                to_taa_c = child(to_taa, "Cads")
+                to_taa_c_vc = child(to_taa_c, "VariousControls")
+                to_taa_a = child(to_taa, "Aads")
+                to_taa_a_vc = child(to_taa_a, "VariousControls")
+                to_taa_ld = child(to_taa, "LDads")
+
+                # noinspection PyCallByClass,SpellCheckingInspection
+                targets.append(Target(
+                    name=text(element, "TargetName"),
+                    toolset=Target.Toolset(
+                        number=strict_hex(element, "ToolsetNumber"),
+                        name=text(element, "ToolsetName")
+                    ),
+                    compiler=Target.Compiler(
+                        cc=text(element, "pCCUsed", nullable=True),
+                        ac6=strict_bool(element, "uAC6")
+                    ),
+                    options=Target.Options(
+                        common=Target.Options.Common(
+                            device=text(tco, "Device"),
+                            vendor=text(tco, "Vendor"),
+                            pack_id=text(tco, "PackID"),
+                            pack_url=text(tco, "PackURL"),
+                            cpu=text(tco, "Cpu"),
+                            device_id=int(text(tco, "DeviceId")),
+                            register_file=text(tco, "RegisterFile")
                         ),
-                        properties=next(
-                            Target.Options.Properties(
-                                use_cpp_compiler=strict_bool(tcp, "UseCPPCompiler"),
-                            ) for tcp in to.xpath("CommonProperty")
+                        properties=Target.Options.Properties(
+                            use_cpp_compiler=strict_bool(tcp, "UseCPPCompiler"),
                         )
-                    ) for to in target.xpath("TargetOption")
-                ),
-                build=next(
-                    Target.Build(
+                    ),
+                    build=Target.Build(
                         misc=Target.Build.Misc(
-                            cpu_type=text(to_taa, "ArmAdsMisc/AdsCpuType"),
+                            cpu_type=text(to_taa_m, "AdsCpuType"),
                             memories=[
                                 Target.Build.Misc.Memory(
                                     name=memory.tag,
                                     type=Target.Build.Misc.Memory.Type(int(text(memory, "Type"))),
                                     start=strict_hex(memory, "StartAddress"),
                                     size=strict_hex(memory, "Size")
-                                ) for memory in to_taa.xpath("ArmAdsMisc/OnChipMemories/*")
+                                ) for memory in _XP_MEMORIES(to_taa_m)
                             ]
                         ),
-                        c=next(
-                            Target.Build.C(
-                                optimization=int(text(to_taa_c, "Optim")),
-                                strict=strict_bool(to_taa_c, "Strict"),
-                                c99=strict_bool(to_taa_c, "uC99"),
-                                gnu=strict_bool(to_taa_c, "uGnu"),
-                                misc=[
-                                    mc.strip() for mc in text(to_taa_c, "VariousControls/MiscControls").split(",")
-                                ],
-                                defines=[
-                                    mc.strip() for mc in text(to_taa_c, "VariousControls/Define").split(" ")
-                                ],
-                                undefines=[
-                                    mc.strip() for mc in (text(to_taa_c, "VariousControls/Undefine") or "").split(" ")
-                                ],
-                                include_paths=[
-                                    mc.strip() for mc in text(to_taa_c, "VariousControls/IncludePath").split(";")
-                                ]
-                            ) for to_taa_c in to_taa.xpath("Cads")
+                        c=Target.Build.C(
+                            optimization=int(text(to_taa_c, "Optim")),
+                            strict=strict_bool(to_taa_c, "Strict"),
+                            c99=strict_bool(to_taa_c, "uC99"),
+                            gnu=strict_bool(to_taa_c, "uGnu"),
+                            misc=text_list(to_taa_c_vc, "MiscControls", ","),
+                            defines=text_list(to_taa_c_vc, "Define", " "),
+                            undefines=text_list(to_taa_c_vc, "Undefine", " "),
+                            include_paths=text_list(to_taa_c_vc, "IncludePath", ";")
                         ),
-                        asm=next(
-                            Target.Build.Asm(
-                                misc=[
-                                    mc.strip() for mc in text(to_taa_a, "VariousControls/MiscControls").split(",")
-                                ],
-                                defines=[
-                                    mc.strip() for mc in text(to_taa_a, "VariousControls/Define").split(" ")
-                                ],
-                                undefines=[
-                                    mc.strip() for mc in (text(to_taa_a, "VariousControls/Undefine") or "").split(" ")
-                                ],
-                                include_paths=[
-                                    mc.strip() for mc in text(to_taa_a, "VariousControls/IncludePath").split(";")
-                                ]
-                            ) for to_taa_a in to_taa.xpath("Aads")
+                        asm=Target.Build.Asm(
+                            misc=text_list(to_taa_a_vc, "MiscControls", ","),
+                            defines=text_list(to_taa_a_vc, "Define", " "),
+                            undefines=text_list(to_taa_a_vc, "Undefine", " "),
+                            include_paths=text_list(to_taa_a_vc, "IncludePath", ";")
                         ),
-                        ld=next(
-                            Target.Build.Linker(
-                                text_address_range=strict_hex(to_taa_ld, "TextAddressRange"),
-                                data_address_range=strict_hex(to_taa_ld, "DataAddressRange"),
-                                misc=[
-                                    mc.strip() for mc in
-                                    text(to_taa_ld, "Misc").split(",")  # TODO: Delimiter unknown
-                                ]
-                            ) for to_taa_ld in to_taa.xpath("LDads")
+                        ld=Target.Build.Linker(
+                            text_address_range=strict_hex(to_taa_ld, "TextAddressRange"),
+                            data_address_range=strict_hex(to_taa_ld, "DataAddressRange"),
+                            misc=text_list(to_taa_ld, "Misc", ",")  # TODO: Delimiter unknown
                         )
-                    ) for to_taa in target.xpath("TargetOption/TargetArmAds")
-                ),
-                groups=[
-                    Target.Group(
-                        name=text(group, "GroupName"),
-                        files=[
-                            Target.File(
-                                name=text(file, "FileName"),
-                                type=FileType(int(text(file, "FileType"))),
-                                path=text(file, "FilePath"),
-                                include_in_build=strict_bool(file, "FileOption/CommonProperty/IncludeInBuild",
-                                                             nullable=True),
-                                always_build=strict_bool(file, "FileOption/CommonProperty/AlwaysBuild",
-                                                         nullable=True, true_value="2")
-                            ) for file in group.xpath("Files/File")
-                        ]
-                    ) for group in target.xpath("Groups/Group")
-                ]
-            ) for target in xproj.xpath("Targets/Target")
-        ]
-
-        # region RTE
-        # noinspection PyCallByClass,PyTypeChecker
-        rte = RTE(
-            packages=[
-                RTE.Package(
-                    name=text(package, "name", True),
-                    url=text(package, "url", True),
-                    vendor=text(package, "vendor", True),
-                    version=text(package, "version", True),
+                    ),
+                    groups=[
+                        Target.Group(
+                            name=text(group, "GroupName"),
+                            files=[
+                                # Positional arguments (name, type, path, include_in_build, always_build), as
+                                # binding keywords is measurably slower for such numerous instances.
+                                Target.File(
+                                    text(file, "FileName"),
+                                    strict_file_type(file, "FileType"),
+                                    text(file, "FilePath"),
+                                    strict_bool(file, "FileOption/CommonProperty/IncludeInBuild", nullable=True),
+                                    strict_bool(file, "FileOption/CommonProperty/AlwaysBuild", nullable=True,
+                                                true_value="2")
+                                ) for file in _XP_FILES(group)
+                            ]
+                        ) for group in _XP_GROUPS(element)
+                    ]
+                ))
+            elif element.tag == "package":
+                package_identity = _package_identity(element.attrib)
+                name, url, vendor, version = package_identity
+                # noinspection PyCallByClass,PyTypeChecker
+                package = RTE.Package(
+                    name=name,
+                    url=url,
+                    vendor=vendor,
+                    version=version,
                     target_infos=[
                         RTE.TargetInfo(
-                            name=text(ti, "name", True),
-                            # Using generator and list only for local variable
-                            version_match_mode=next(RTE.TargetInfo.VersionMatchMode(vmm) if vmm else None
-                                                    for vmm in [text(ti, "versionMatchMode", True, True)])
-                        ) for ti in package.xpath("targetInfos/targetInfo")
+                            name=sys.intern(ti.attrib["name"]),
+                            version_match_mode=strict_version_match_mode(ti, "versionMatchMode")
+                        ) for ti in _XP_TARGET_INFOS(element)
                     ]
-                ) for package in xproj.xpath("RTE/packages/package")
-            ],
-            components=[
-                RTE.Component(
-                    class_=text(component, "Cclass", True),
-                    group=text(component, "Cgroup", True),
-                    vendor=text(component, "Cvendor", True),
-                    version=text(component, "Cversion", True),
-                    condition=text(component, "condition", True),
-                    package=next(
-                        # There is always only one package, but using generator is clean and
-                        # effective way of creating an inline local variable.
-                        # This new instance of package will be replaced below with reference to an actual matching
-                        # instance of the package from rte.packages.
-                        RTE.Package(
-                            name=text(package, "name", True),
-                            url=text(package, "url", True),
-                            vendor=text(package, "vendor", True),
-                            version=text(package, "version", True),
-                            target_infos=None
-                        ) for package in component.xpath("package")
-                    ),
+                )
+                rte.packages.append(package)
+                packages.setdefault(package_identity, package)
+            elif element.tag == "component":
+                # There is always only one package.
+                component_packages.append(_package_identity(child(element, "package").attrib))
+                attrib = element.attrib
+                # noinspection PyCallByClass,PyTypeChecker
+                rte.components.append(RTE.Component(
+                    class_=sys.intern(attrib["Cclass"]),
+                    group=sys.intern(attrib["Cgroup"]),
+                    vendor=sys.intern(attrib["Cvendor"]),
+                    version=sys.intern(attrib["Cversion"]),
+                    condition=sys.intern(attrib["condition"]),
+                    # Reference to an actual matching instance of the package from rte.packages is set below.
+                    package=None,
                     target_infos=[
                         RTE.TargetInfo(
-                            name=text(ti, "name", True),
+                            name=sys.intern(ti.attrib["name"]),
                             # TODO: Handle nullable
                             # RTE.TargetInfo.VersionMatchMode(text(ti, "versionMatchMode", True, True))
                             version_match_mode=None
-                        ) for ti in component.xpath("targetInfos/targetInfo")
+                        ) for ti in _XP_TARGET_INFOS(element)
                     ]
-                ) for component in xproj.xpath("RTE/components/component")
-            ],
-            files=[
-                RTE.File(
-                    attr=RTE.File.Attribute(text(file, "attr", True)),
-                    category=RTE.File.Category(text(file, "category", True)),
-                    condition=text(file, "condition", True, True),
-                    name=text(file, "name", True),
-                    version=text(file, "version", True),
-                    instance=text(file, "instance"),
-                    component=next(
-                        RTE.Component(
-                            class_=text(component, "Cclass", True),
-                            group=text(component, "Cgroup", True),
-                            vendor=text(component, "Cvendor", True),
-                            version=text(component, "Cversion", True),
-                            condition=text(component, "condition", True),
-                            package=None,
-                            target_infos=None
-                        ) for component in file.xpath("component")
+                ))
+            elif element.tag == "file":
+                # There is always only one component.
+                component_attrib = child(element, "component").attrib
+                attrib = element.attrib
+                condition = attrib.get("condition")
+                # noinspection PyCallByClass,PyTypeChecker
+                rte.files.append(RTE.File(
+                    attr=RTE.File.Attribute(attrib["attr"]),
+                    category=RTE.File.Category(attrib["category"]),
+                    condition=sys.intern(condition) if (condition is not None) else None,
+                    name=attrib["name"],
+                    version=sys.intern(attrib["version"]),
+                    instance=text(element, "instance"),
+                    component=RTE.Component(
+                        class_=sys.intern(component_attrib["Cclass"]),
+                        group=sys.intern(component_attrib["Cgroup"]),
+                        vendor=sys.intern(component_attrib["Cvendor"]),
+                        version=sys.intern(component_attrib["Cversion"]),
+                        condition=sys.intern(component_attrib["condition"]),
+                        package=None,
+                        target_infos=None
                     ),
                     package=None,  # TODO
                     target_infos=None,  # TODO
-                ) for file in xproj.xpath("RTE/files/file")
-            ]
-        )
+                ))
+            else:
+                raise ValueError(f"Unexpected '{element.tag}' element in the Project File")
+
+        # region RTE
         # TODO: Connect actual references of the rte.packages and rte.packages.target_infos
-        for component in rte.components:
-            cp = component.package
-            component.package = None
-            cp.target_infos = None
-            for package in rte.packages:
-                # Temporally remove target_infos to enable usage of equality operator.
-                pti = package.target_infos
-                package.target_infos = None
-                if cp == package:
-                    component.package = package
-                    package.target_infos = pti
-                    break
-                package.target_infos = pti
+        for component, package_identity in zip(rte.components, component_packages):
+            component.package = packages.get(package_identity)
         # endregion RTE
 
         # endregion Project File
 
         # region Project Options
-        if xopt.tag != "ProjectOpt":
+        xopt = iter_elements(project_options_path, "Group")
+        if next(xopt).tag != "ProjectOpt":
             raise ValueError("Invalid uVision Project Options XML file")
 
         groups: List[Group] = []
-        for group in xopt.xpath("Group"):
+        for group in xopt:
             group_name = text(group, "GroupName")
             # Find this group in the Project File
             xproj_group = next(g for g in next(iter(targets)).groups if (g.name == group_name))
 
             # Find all files in this group and also in the Project File
             files: List[File] = []
-            for file in group.xpath("File"):
-                file_type = FileType(int(text(file, "FileType")))
-                file_name = text(file, "FilenameWithoutPath")
+            for file in group.iterchildren("File"):
+                # Almost all of the File children are read, collect them at once instead of searching for every one.
+                fields = child_texts(file)
+                file_type = field_file_type(fields, "FileType")
+                file_name = field_text(fields, "FilenameWithoutPath")
 
                 xproj_file = next(f for f in xproj_group.files if (f.type == file_type and f.name == file_name))
 
+                # Positional arguments in the field order, binding keywords is measurably slower for such
+                # numerous instances.
                 files.append(File(
-                    group_number=int(text(file, "GroupNumber")),
-                    number=int(text(file, "FileNumber")),
-                    type=file_type,
-                    expanded=strict_bool(file, "tvExp"),
-                    include_in_build=xproj_file.include_in_build,
-                    always_build=xproj_file.always_build,
-                    tv_exp_opt_dlg=strict_bool(file, "tvExpOptDlg"),
-                    dave2=strict_bool(file, "bDave2"),
-                    path=text(file, "PathWithFileName"),
-                    filename=file_name,
-                    rte_flag=strict_bool(file, "RteFlg"),
-                    shared=strict_bool(file, "bShared")
+                    int(field_text(fields, "GroupNumber")),  # group_number
+                    int(field_text(fields, "FileNumber")),  # number
+                    file_type,  # type
+                    field_bool(fields, "tvExp"),  # expanded
+                    xproj_file.include_in_build,  # include_in_build
+                    xproj_file.always_build,  # always_build
+                    field_bool(fields, "tvExpOptDlg"),  # tv_exp_opt_dlg
+                    field_bool(fields, "bDave2"),  # dave2
+                    field_text(fields, "PathWithFileName"),  # path
+                    file_name,  # filename
+                    field_bool(fields, "RteFlg"),  # rte_flag
+                    field_bool(fields, "bShared")  # shared
                 ))
 
             groups.append(Group(
@@ -593,43 +805,43 @@ class UVisionProject:
         # endregion Project Options
 
         # Add RTE files to the file groups to actually match the Project Window file browser.
-        for file in rte.files:
-            # Find the group to which this file belongs to (there shall be one and only one).
-            group = None
-            group_number = 1
+        if rte.files:
+            # File numbers are global across all groups, RTE files are numbered after all the regular files.
+            file_number = max((f.number for g in groups for f in g.files), default=0)
+            # RTE groups are named by the component class, prefixed with double colon (::).
+            rte_groups: Dict[str, Tuple[int, Group]] = {}
             for group_number, group in enumerate(groups, 1):
                 if group.files and group.files[0].group_number != group_number:
                     warnings.warn(f"Inconsistent group number {group.files[0].group_number} for group {group.name}"
                                   f" (expected to be {group_number})")
-                if group.rte_flag and group.name.strip(":") == file.component.class_:
-                    break
-            filename = os.path.basename(file.instance)
-            # Detect file type (this information is not provided for RTE files)
-            if filename.endswith(".s"):
-                file_type = FileType.ASM_SOURCE
-            elif filename.endswith(".c"):
-                file_type = FileType.C_SOURCE
-            elif filename.endswith(".cpp"):
-                file_type = FileType.CPP_SOURCE
-            elif filename.endswith(".h"):
-                file_type = FileType.TEXT_DOCUMENT
-            else:
-                warnings.warn(f"Unknown RTE file type '{file.instance}': {file}")
-                continue
-            group.files.append(File(
-                group_number=group_number,
-                number=max(f.number for g in groups for f in g.files) + 1,
-                type=file_type,
-                expanded=False,
-                include_in_build=True,  # TODO: This information is available for RTE files
-                always_build=None,
-                tv_exp_opt_dlg=False,  # TODO
-                dave2=False,  # TODO
-                path=file.instance,
-                filename=os.path.basename(file.instance),
-                rte_flag=True,
-                shared=False
-            ))
+                if group.rte_flag:
+                    rte_groups.setdefault(group.name.strip(":"), (group_number, group))
+            # Files of the components without own group end up in the last group.
+            last_group = (len(groups), groups[-1]) if groups else (1, None)
+            for file in rte.files:
+                # Find the group to which this file belongs to (there shall be one and only one).
+                group_number, group = rte_groups.get(file.component.class_, last_group)
+                filename = os.path.basename(file.instance)
+                # Detect file type (this information is not provided for RTE files)
+                file_type = _RTE_EXT_TO_TYPE.get(os.path.splitext(filename)[1])
+                if file_type is None:
+                    warnings.warn(f"Unknown RTE file type '{file.instance}': {file}")
+                    continue
+                file_number += 1
+                group.files.append(File(
+                    group_number=group_number,
+                    number=file_number,
+                    type=file_type,
+                    expanded=False,
+                    include_in_build=True,  # TODO: This information is available for RTE files
+                    always_build=None,
+                    tv_exp_opt_dlg=False,  # TODO
+                    dave2=False,  # TODO
+                    path=file.instance,
+                    filename=filename,
+                    rte_flag=True,
+                    shared=False
+                ))
 
         return cls(
             project_file_path=project_file_path,
@@ -640,7 +852,10 @@ class UVisionProject:
 
     def source_files(self) -> Iterator[Tuple[File, Optional[Language], Optional[str]]]:
         """
-        Get all files grouped by the file type with group names as a comments.
+        Get all files with their language and group names as a comments.
+
+        Files are yielded in the order of the Project Window file browser, the group name comment is provided
+        with the first file of every file type in the group (as they are in the separate sections).
         """
         # Add source files
         for group in self.groups:
@@ -649,45 +864,39 @@ class UVisionProject:
                 # RTE groups start with double colon (::).
                 comment = "RTE" + comment
 
-            # Group files by type and add one comment for every file type as they are in the separate sections.
-            files: Dict[Union[Language, None], List[File]] = defaultdict(list)
+            # Languages (file types) for which the comment has already been provided in this group.
+            commented: Set[Optional[Language]] = set()
 
             for file in group.files:
-                if file.type == FileType.ASM_SOURCE:
-                    lang = Language.ASM
-                elif file.type == FileType.C_SOURCE:
-                    lang = Language.C
-                elif file.type == FileType.TEXT_DOCUMENT:
-                    lang = None
-                else:
+                lang = _TYPE_TO_LANG.get(file.type, _MISSING)
+                if lang is _MISSING:
                     warnings.warn(f"Unsupported file type: {file.type} for {file}")
                     continue
-                files[lang].append(file)
-
-            for lang, files in files.items():
-                comment_per_type = comment
-                for file in files:
-                    yield file, lang, comment_per_type
-                    comment_per_type = None
+                if lang in commented:
+                    yield file, lang, None
+                else:
+                    commented.add(lang)
+                    yield file, lang, comment
 
 
 class CMake:
-    @dataclass
     class String:
-        value: str
-        """The actual string value."""
-        languages: Set[Language]
-        """Set of all build configs in which this value is present."""
-        common: bool = False
-        comment: Optional[str] = None
-        """Comment which will be added to the line before"""
-
-        def __eq__(self, o: 'CMake.String') -> bool:
-            if isinstance(o, type(self)):
-                return self.value == o.value
-            elif isinstance(o, str):
-                return self.value == o
-            return NotImplemented
+        # Many instances are created and their attributes are accessed frequently, hence slots instead of dataclass.
+        __slots__ = ("value", "languages", "common", "comment")
+
+        def __init__(self, value: str, languages: Set[Language], common: bool = False,
+                     comment: Optional[str] = None) -> None:
+            self.value = value
+            """The actual string value."""
+            self.languages = languages
+            """Set of all build configs in which this value is present."""
+            self.common = common
+            self.comment = comment
+            """Comment which will be added to the line before"""
+
+        def __repr__(self) -> str:
+            return (f"{type(self).__qualname__}(value={self.value!r}, languages={self.languages!r},"
+                    f" common={self.common!r}, comment={self.comment!r})")
 
     def __init__(self) -> None:
         self.include_paths: List[CMake.String] = []
@@ -695,60 +904,94 @@ class CMake:
         self.undefines: List[CMake.String] = []
         self.source_file_paths: List[CMake.String] = []
         self.other_file_paths: List[CMake.String] = []
-
-    @classmethod
-    def _get(cls, lst: List[String], obj: str) -> String:
-        """Get existing object from the list or append a new one to the end."""
-        try:
-            # noinspection PyTypeChecker
-            itm = lst[lst.index(obj)]
-        except ValueError:
-            # noinspection PyCallByClass
-            itm = cls.String(obj, set())
-            lst.append(itm)
-        return itm
-
-    @classmethod
-    def _add_values(cls, where: List[String], values: Union[str, Iterable[str]],
+        # Indexes of the above lists by the string value, for constant-time lookup of the existing values.
+        self._include_paths_index: Dict[str, CMake.String] = {}
+        self._defines_index: Dict[str, CMake.String] = {}
+        self._undefines_index: Dict[str, CMake.String] = {}
+        self._source_file_paths_index: Dict[str, CMake.String] = {}
+        self._other_file_paths_index: Dict[str, CMake.String] = {}
+        # All of the languages used by any of the properties, tracked as the values are added.
+        self._languages: Set[Language] = set()
+
+    def _add_values(self, where: List[String], index: Dict[str, String], values: Union[str, Iterable[str]],
                     languages: Union[Language, Collection[Language], None], comment: Optional[str] = None) -> None:
+        """Add values to the list (or update existing ones, found using the index of the list)."""
         if isinstance(languages, Language):
-            languages = [languages]
+            languages = _LANG_SETS[languages]
+        elif not languages:
+            languages = _LANG_SETS[None]
 
         for val in values:
-            obj = cls._get(where, val)
-            if comment is not None:
-                # Add comment to the first value only
-                obj.comment = comment
-                comment = None
-            if languages:
-                obj.languages.update(languages)
+            self._add_value(where, index, val, languages, comment)
+            # Add comment to the first value only
+            comment = None
+
+    def _add_value(self, where: List[String], index: Dict[str, String], value: str,
+                   languages: Collection[Language], comment: Optional[str] = None) -> None:
+        """Add single value to the list (or update existing one), `languages` shall already be a collection."""
+        obj = index.get(value)
+        if obj is None:
+            # noinspection PyCallByClass
+            obj = index[value] = self.String(value, set(languages))
+            where.append(obj)
+        elif languages:
+            obj.languages.update(languages)
+        if comment is not None:
+            obj.comment = comment
+        if languages:
+            self._languages.update(languages)
 
     @staticmethod
-    def _clean_paths(paths: Union[str, Iterable[str]]) -> List[str]:
+    def _clean_path(path: str) -> str:
+        # Only the separator needs to be converted after normalization, no need to construct Path objects.
+        return os.path.normpath(path).replace(os.sep, "/")
+
+    @classmethod
+    def _clean_paths(cls, paths: Union[str, Iterable[str]]) -> List[str]:
         if isinstance(paths, (str, Path)):
             paths = [paths]
-        return [Path(p).as_posix() for p in map(os.path.normpath, paths)]
+        return [cls._clean_path(p) for p in paths]
+
+    @staticmethod
+    def _file_path_entry(path: str, include_in_build: Optional[bool]) -> str:
+        # If file is not included in the build, comment it
+        return ("# " + path) if (include_in_build is False) else path
 
     def add_include_paths(self, paths: Union[str, Iterable[str]], languages: Union[Language, Collection[Language]],
                           comment: str = None) -> None:
-        self._add_values(self.include_paths, self._clean_paths(paths), languages, comment)
+        self._add_values(self.include_paths, self._include_paths_index, self._clean_paths(paths), languages, comment)
 
     def add_defines(self, defines: Union[str, Iterable[str]], languages: Union[Language, Collection[Language]],
                     comment: str = None) -> None:
-        self._add_values(self.defines, defines, languages, comment)
+        self._add_values(self.defines, self._defines_index, defines, languages, comment)
 
     def add_undefines(self, undefines: Union[str, Iterable[str]], languages: Union[Language, Collection[Language]],
                       comment: str = None) -> None:
-        self._add_values(self.undefines, undefines, languages, comment)
+        self._add_values(self.undefines, self._undefines_index, undefines, languages, comment)
 
     def add_source_files(self, paths: Union[None, str, Iterable[str]],
                          languages: Union[Language, Collection[Language], None],
                          comment: str = None, include_in_build: bool = True) -> None:
-        paths = self._clean_paths(paths)
-        # If file is not included in the build, comment it
-        if include_in_build is False:
-            paths = ["# " + path for path in paths]
-        self._add_values(self.source_file_paths if languages else self.other_file_paths, paths, languages, comment)
+        paths = [self._file_path_entry(path, include_in_build) for path in self._clean_paths(paths)]
+        if languages:
+            self._add_values(self.source_file_paths, self._source_file_paths_index, paths, languages, comment)
+        else:
+            self._add_values(self.other_file_paths, self._other_file_paths_index, paths, languages, comment)
+
+    def add_source_files_bulk(
+            self, files: Iterable[Tuple[str, Optional[Language], Optional[str], Optional[bool]]]) -> None:
+        """
+        Add many source (and other) files, each with its own language, comment and build inclusion, in a single pass.
+
+        :param files: (path, language, comment, include_in_build) for every file, as for :meth:`add_source_files`.
+        """
+        for path, language, comment, include_in_build in files:
+            path = self._file_path_entry(self._clean_path(path), include_in_build)
+            if language:
+                self._add_value(self.source_file_paths, self._source_file_paths_index, path, _LANG_SETS[language],
+                                comment)
+            else:
+                self._add_value(self.other_file_paths, self._other_file_paths_index, path, _LANG_SETS[None], comment)
 
     def add_other_files(self, paths: Union[str, Iterable[str]], comment: str = None) -> None:
         self.add_source_files(paths, None, comment)
@@ -761,70 +1004,91 @@ class CMake:
         """
         all_props = (self.include_paths, self.defines, self.undefines, self.source_file_paths)
 
-        # Get all of the defined languages used
-        languages = {lang
-                     for props in all_props
-                     for prop in props
-                     for lang in prop.languages}
+        # All of the defined languages used are already known
+        languages = set(self._languages)
 
+        # Languages of every property are a subset of all languages, so comparing the sizes is enough.
+        n_languages = len(languages)
         for props in all_props:
             for prop in props:
-                prop.common = (prop.languages == languages)
+                prop.common = (len(prop.languages) == n_languages)
 
         return languages
 
     def __str__(self) -> str:
-        languages = sorted(self.check_common(), key=operator.attrgetter('value'))
+        return "".join(self._iter_text())
 
-        ret_str = [
-            "# Made with CMake <> uVision project file synchronizer"
-            "# https://github.com/bojanpotocnik/cmake-uvision-syncer"
-        ]
+    def write_to(self, fp: TextIO) -> None:
+        """Write the CMake file contents directly to the file object, without building the whole text first."""
+        fp.writelines(self._iter_text())
+        fp.write("\n")
 
-        # Set of the build properties
-        prop_sets: List[Tuple[str, str, List[CMake.String], str]] = [
-            ("definitions", "DEFINES", self.defines, "-D"),
-            ("un-defines", "UNDEFINES", self.undefines, ""),
-            ("include directories", "INCLUDE_DIRS", self.include_paths, ""),
-            ("source files", "SOURCES", self.source_file_paths, ""),
-        ]
+    _PROP_SETS: Tuple[Tuple[str, str, str, str], ...] = (
+        ("definitions", "DEFINES", "defines", "-D"),
+        ("un-defines", "UNDEFINES", "undefines", ""),
+        ("include directories", "INCLUDE_DIRS", "include_paths", ""),
+        ("source files", "SOURCES", "source_file_paths", ""),
+    )
+    """Set of the build properties (section comment, variable prefix, attribute name, value prefix)."""
 
-        # Set of the language configs per build property
-        sub_prop_sets: List[Tuple[str, str, Callable[[CMake.String], bool]]] = [
-            ("Common", "COMMON", lambda prop: prop.common),
-            *((lang.value + " specific", lang.name,
-               lambda prop, lang_=lang: (not prop.common) and (lang_ in prop.languages))
-              for lang in languages)
-        ]
+    @staticmethod
+    def _split_by_language(props: List[String], languages: Iterable[Optional[Language]]
+                           ) -> Dict[Optional[Language], List[String]]:
+        """Distribute the properties to the language configs in a single pass, preserving their order."""
+        by_language: Dict[Optional[Language], List[CMake.String]] = {lang: [] for lang in languages}
+        common = by_language[None]
+        for prop in props:
+            if prop.common:
+                common.append(prop)
+            else:
+                for lang in prop.languages:
+                    by_language[lang].append(prop)
+        return by_language
 
-        def _add_section_files(comment: str, var_name: str, value_iterator: Iterable[CMake.String],
-                               value_prefix: str = "") -> str:
-            s = (f"# {comment}\n"
-                 f"set({var_name}")
-            for value in value_iterator:
-                if value.comment is not None:
-                    s += f"\n\t# {value.comment}"
-                s += f"\n\t{value_prefix}{value.value}"
-            return s + "\n)"
-
-        for section_comment, section_var_prefix, section_props, val_prefix in prop_sets:
-            ss_str = []
-            for prop_set_comment, var_suffix, filter_fun in sub_prop_sets:
-                ss_str.append(_add_section_files(
+    @staticmethod
+    def _section_text(comment: str, var_name: str, value_iterator: Iterable[String], value_prefix: str = "") -> str:
+        lines = [f"# {comment}", f"set({var_name}"]
+        for value in value_iterator:
+            if value.comment is not None:
+                lines.append(f"\t# {value.comment}")
+            lines.append(f"\t{value_prefix}{value.value}")
+        lines.append(")")
+        return "\n".join(lines)
+
+    def _iter_text(self) -> Iterator[str]:
+        """Generate the text of the CMake file in chunks."""
+        languages = sorted(self.check_common(), key=operator.attrgetter('value'))
+
+        yield ("# Made with CMake <> uVision project file synchronizer"
+               "# https://github.com/bojanpotocnik/cmake-uvision-syncer")
+
+        # Set of the language configs per build property (`None` for the common properties)
+        sub_prop_sets: List[Tuple[str, str, Optional[Language]]] = [
+            ("Common", "COMMON", None),
+            *((lang.value + " specific", lang.name, lang) for lang in languages)
+        ]
+        sub_prop_languages = [lang for _, _, lang in sub_prop_sets]
+
+        for section_comment, section_var_prefix, section_attr, val_prefix in self._PROP_SETS:
+            section_props_by_language = self._split_by_language(getattr(self, section_attr), sub_prop_languages)
+            # Sections are separated by two empty lines, language configs within the section by one.
+            separator = "\n\n\n"
+            for prop_set_comment, var_suffix, lang in sub_prop_sets:
+                yield separator
+                yield self._section_text(
                     comment=f"{prop_set_comment} {section_comment}",
                     var_name=f"{section_var_prefix}_{var_suffix}",
-                    value_iterator=filter(filter_fun, section_props),
+                    value_iterator=section_props_by_language[lang],
                     value_prefix=val_prefix
-                ))
-            ret_str.append("\n\n".join(ss_str))
+                )
+                separator = "\n\n"
 
-        ret_str.append(_add_section_files(
+        yield "\n\n\n"
+        yield self._section_text(
             comment="Other files",
             var_name="OTHER_FILES",
             value_iterator=self.other_file_paths
-        ))
-
-        return "\n\n\n".join(ret_str)
+        )
 
 
 def main() -> None:
@@ -834,16 +1098,22 @@ def main() -> None:
 
     if not os.path.isfile(project_path):
         with os.scandir(project_path) as dirs:  # type: Iterator[DirEntry]
-            projects = [de.path for de in dirs if (de.is_file() and (os.path.splitext(de.name)[1] == ".uvprojx"))]
+            # Check the name first as it is much cheaper than the file type check.
+            projects = [de for de in dirs if (de.name.endswith(".uvprojx") and de.is_file())]
 
         if not projects:
             raise FileNotFoundError(f"Could not find any .uvprojx file in '{project_path}'")
         elif len(projects) > 1:
             # Choose the latest file by modification time.
-            project_path = max(projects, key=os.path.getmtime)
+            project_path = max(projects, key=lambda de: de.stat().st_mtime).path
         else:
-            project_path = projects[0]
-    project_path = os.path.realpath(project_path)
+            project_path = projects[0].path
+    if not os.path.isabs(project_path) or os.path.islink(project_path):
+        project_path = os.path.realpath(project_path)
+    else:
+        # Absolute path only needs to be normalized ("." and ".." removed), symbolic links in the parent
+        # directories are left as given.
+        project_path = os.path.normpath(project_path)
     # endregion Parse arguments
 
     print(f"Using µVision5 Project File '{project_path}'")
@@ -865,13 +1135,13 @@ def main() -> None:
     cmake.add_undefines(uvp.targets[0].build.c.undefines, Language.C)
 
     # Add source and other files
-    for file, lang, comment in uvp.source_files():
-        cmake.add_source_files(file.path, lang, comment, file.include_in_build)
+    cmake.add_source_files_bulk((file.path, lang, comment, file.include_in_build)
+                                for file, lang, comment in uvp.source_files())
 
-    fp_proj_cmake = os.path.join(os.path.dirname(uvp.project_file_path),
-                                 os.path.splitext(os.path.basename(uvp.project_file_path))[0] + ".cmake")
-    with open(fp_proj_cmake, 'w') as f:
-        print(cmake, file=f)
+    # CMake file is placed next to the project file, having the same filename.
+    fp_proj_cmake = os.path.splitext(uvp.project_file_path)[0] + ".cmake"
+    with open(fp_proj_cmake, 'w', buffering=1 << 16) as f:
+        cmake.write_to(f)
     print(f"Generated CMake file '{fp_proj_cmake}'")
 
 